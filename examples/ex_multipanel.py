@@ -8,22 +8,24 @@ from spiffyplots import MultiPanel
 # Data
 # # # # # #
 
+# Seeded once so that the example is reproducible
+rng = np.random.default_rng(0)
+
+t = np.arange(0, 25, 0.1)
+sin, cos = np.sin(t), np.cos(t)
+
 data = {
-    "scatter1-x": np.random.randn(200),
-    "scatter1-y": np.random.randn(200),
-    "scatter2-x": np.random.rand(200),
-    "scatter2-y": np.random.rand(200),
-    "hist-gauss": np.random.randn(500),
-    "hist-gamma": np.random.gamma(5, 8, 500),
-    "heatmap": np.random.rand(100).reshape(10, 10),
-    "timeseries1": np.array(
-        [np.sin(np.arange(0, 25, 0.1)) + np.random.randn(250) for _ in range(20)]
-    ),
-    "timeseries1-true": np.sin(np.arange(0, 25, 0.1)),
-    "timeseries2": np.array(
-        [np.cos(np.arange(0, 25, 0.1)) + np.random.randn(250) for _ in range(20)]
-    ),
-    "timeseries2-true": np.cos(np.arange(0, 25, 0.1)),
+    "scatter1-x": rng.standard_normal(200),
+    "scatter1-y": rng.standard_normal(200),
+    "scatter2-x": rng.random(200),
+    "scatter2-y": rng.random(200),
+    "hist-gauss": rng.standard_normal(500),
+    "hist-gamma": rng.gamma(5, 8, 500),
+    "heatmap": rng.random((10, 10)),
+    "timeseries1": sin + rng.standard_normal((20, t.size)),
+    "timeseries1-true": sin,
+    "timeseries2": cos + rng.standard_normal((20, t.size)),
+    "timeseries2-true": cos,
 }
 
 # Functions
@@ -44,38 +46,30 @@ def scatter(axis, x, y, c="black"):
 
 def timeseries(axis, y, true=False, c="black"):
     x = np.arange(0, y.shape[1])
-    std = np.std(y, 0)
-    axis.plot(y.mean(0), zorder=1, color=c)
+    mu = y.mean(axis=0)
+    std = y.std(axis=0)
+    axis.plot(mu, zorder=1, color=c)
     if True:
         axis.plot(true, zorder=2, color="black")
-    axis.fill_between(
-        x, y.mean(0) - std, y.mean(0) + std, zorder=0, facecolor=c, alpha=0.3
-    )
+    axis.fill_between(x, mu - std, mu + std, zorder=0, facecolor=c, alpha=0.3)
     axis.set_xlabel("time (s)")
     axis.set_ylabel("value")
 
 
-# PLOTTING
-colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+def render(fig, colors):
+    hist(fig.panels[0], data["hist-gauss"], colors[0])
+    scatter(fig.panels[1], data["scatter1-x"], data["scatter1-y"], colors[0])
+    timeseries(fig.panels[4], data["timeseries1"], data["timeseries1-true"], colors[0])
 
-fig = MultiPanel(
-    grid=(4, 2),
-    figsize=(9, 4),
-    labels=True
-)
-
-hist(fig.panels[0], data["hist-gauss"], colors[0])
-scatter(fig.panels[1], data["scatter1-x"], data["scatter1-y"], colors[0])
-timeseries(fig.panels[4], data["timeseries1"], data["timeseries1-true"], colors[0])
-
-hist(fig.panels[2], data["hist-gamma"], colors[1])
-scatter(fig.panels[3], data["scatter2-x"], data["scatter2-y"], colors[1])
-timeseries(fig.panels[5], data["timeseries2"], data["timeseries2-true"], colors[1])
+    hist(fig.panels[2], data["hist-gamma"], colors[1])
+    scatter(fig.panels[3], data["scatter2-x"], data["scatter2-y"], colors[1])
+    timeseries(fig.panels[5], data["timeseries2"], data["timeseries2-true"], colors[1])
 
-fig.fig.savefig("multipanel_mpl.png")
 
+# PLOTTING
+# A lower PNG compression level saves considerably faster at a small cost in file size
+save_kwargs = dict(pil_kwargs={"compress_level": 3}, metadata={"Software": None})
 
-plt.style.use("spiffy")
 colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
 
 fig = MultiPanel(
@@ -83,14 +77,19 @@ fig = MultiPanel(
     figsize=(9, 4),
     labels=True
 )
+render(fig, colors)
+fig.fig.savefig("multipanel_mpl.png", **save_kwargs)
+
 
-hist(fig.panels[0], data["hist-gauss"], colors[0])
-scatter(fig.panels[1], data["scatter1-x"], data["scatter1-y"], colors[0])
-timeseries(fig.panels[4], data["timeseries1"], data["timeseries1-true"], colors[0])
+with plt.style.context("spiffy"):
+    colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
 
-hist(fig.panels[2], data["hist-gamma"], colors[1])
-scatter(fig.panels[3], data["scatter2-x"], data["scatter2-y"], colors[1])
-timeseries(fig.panels[5], data["timeseries2"], data["timeseries2-true"], colors[1])
+    fig = MultiPanel(
+        grid=(4, 2),
+        figsize=(9, 4),
+        labels=True
+    )
+    render(fig, colors)
 
-plt.show()
-fig.fig.savefig("multipanel_spiffy.png")
+    plt.show()
+    fig.fig.savefig("multipanel_spiffy.png", **save_kwargs)
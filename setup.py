@@ -44,13 +44,14 @@ def install_styles():
     if not os.path.exists(mpl_stylelib_dir):
         os.makedirs(mpl_stylelib_dir)
 
-    # Copy files over
+    # Copy files over. matplotlib only reads the top level of stylelib,
+    # so the styles are flattened rather than copied as a directory tree.
     print("Installing styles into", mpl_stylelib_dir)
     for stylefile in stylefiles:
-        print(os.path.basename(stylefile))
-        shutil.copy(
+        shutil.copyfile(
             stylefile, os.path.join(mpl_stylelib_dir, os.path.basename(stylefile))
         )
+    print("Installed {} styles".format(len(stylefiles)))
 
 
 class PostInstallMoveFile(install):
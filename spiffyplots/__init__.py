@@ -4,5 +4,26 @@ __author__ = """Julian Rossbroich"""
 __email__ = "julian.rossbroich@fmi.ch"
 __version__ = "0.6.1"
 
-from .multipanel import MultiPanel
-from .lineplots import multiline
+import importlib
+
+__all__ = ["MultiPanel", "multiline"]
+
+
+def __getattr__(name):
+    # Import the plotting tools lazily, so that ``import spiffyplots``
+    # does not pay for importing matplotlib.pyplot
+    if name == "MultiPanel":
+        from .multipanel import MultiPanel
+
+        return MultiPanel
+
+    if name == "multiline":
+        from .lineplots import multiline
+
+        return multiline
+
+    # submodules were bound on the package by the former eager imports
+    if name in ("multipanel", "lineplots"):
+        return importlib.import_module("." + name, __name__)
+
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -28,7 +28,17 @@ def multiline(x: Iterable, y: Iterable, c: Iterable, axis=None, **kwargs):
         axis = plt.gca()
 
     # Make a LineCollection Object
-    segments = [np.column_stack([x, y]) for x, y in zip(xs, ys)]
+    #    Lines of equal length are stacked into one (lines, points, 2) array,
+    #    ragged lines fall back to a list of (points, 2) arrays.
+    try:
+        xs, ys = np.asarray(x), np.asarray(y)
+    except ValueError:
+        xs = ys = None
+
+    if xs is not None and xs.ndim == 2 and xs.shape == ys.shape:
+        segments = np.stack([xs, ys], axis=-1)
+    else:
+        segments = [np.column_stack([xi, yi]) for xi, yi in zip(x, y)]
     lc = LineCollection(segments, **kwargs)
 
     # set coloring of line segments
@@ -37,6 +47,6 @@ def multiline(x: Iterable, y: Iterable, c: Iterable, axis=None, **kwargs):
 
     # add lines to axes and rescale
     #    Note: adding a collection doesn't autoscalee xlim/ylim
-    ax.add_collection(lc)
-    ax.autoscale()
+    axis.add_collection(lc)
+    axis.autoscale()
     return lc
@@ -2,8 +2,8 @@
 """The Spiffy MultiPanel class and its methods.
 """
 
-from collections import defaultdict
-from itertools import product, combinations
+from functools import lru_cache, reduce
+from itertools import product
 import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gs
@@ -11,11 +11,20 @@ import numpy as np
 import string
 import math
 
-from collections import namedtuple
 from typing import Dict, Tuple, Union, Optional, Iterable
 import warnings
 
 
+# Alphabets used for default panel labels
+_LETTERS = {
+    "uppercase": string.ascii_uppercase,
+    "lowercase": string.ascii_lowercase,
+}
+
+# GridSpec kwargs that fix the panel layout manually
+_GRIDSPEC_SPACING = ("left", "right", "bottom", "top", "wspace", "hspace")
+
+
 class MultiPanel(object):
 
     """
@@ -101,6 +110,8 @@ class MultiPanel(object):
 
         Keyword Args:
             figsize (Tuple): Size of the figure. Will be passed into ``matplotlib.pyplot.figure``.
+            constrained_layout (bool): Whether the figure uses constrained layout. Defaults to True,
+                unless any of the margin or spacing kwargs below is given.
 
             label_case (str): 'uppercase' or 'lowercase'.
                 This and following kwargs are passed to ``MultiPanel._draw_labels``.
@@ -124,13 +135,26 @@ class MultiPanel(object):
         self.shape = shape
         self._locations = []
         self._labels = []
+        self._specs = []
         self.panels = []
 
+        # colors of the property cycle in the style that is active at construction
+        self._prop_colors = plt.rcParams["axes.prop_cycle"].by_key().get("color", [])
+
         # parse kwargs
         figsize = kwargs.pop("figsize", plt.rcParams.get("figure.figsize"))
         dpi = kwargs.pop("dpi", plt.rcParams.get("figure.dpi"))
 
-        self.fig = plt.figure(figsize=figsize, dpi=dpi)
+        # Constrained layout arranges the panels at draw time, so figures do not need
+        # to be saved with ``bbox_inches='tight'``, which renders them twice.
+        # Explicit GridSpec margins or spacings take precedence over it.
+        constrained_layout = kwargs.pop(
+            "constrained_layout", not any(k in kwargs for k in _GRIDSPEC_SPACING)
+        )
+
+        self.fig = plt.figure(
+            figsize=figsize, dpi=dpi, constrained_layout=constrained_layout
+        )
 
         # OPTION 1: INITIALIZATION BASED ON ``labels``
         # # # # # # # # # # # #
@@ -164,12 +188,19 @@ class MultiPanel(object):
 
             if grid is not None:
 
+                # The first element of ``grid`` determines the input type. Ill-formed ints
+                # raise a TypeError in the helpers, tuple grids are checked explicitly.
+                grid = list(grid)
+                head = grid[0] if grid else None
+
                 # OPTION 2.1: grid is passed as an Iterable of ints
-                if all(isinstance(i, int) for i in grid):
+                if isinstance(head, int):
                     self.shape, grid, self.npanels = _get_subplot_raster(grid)
 
                 # OPTION 2.2: grid is passed as an Iterable of Tuples
-                elif all(isinstance(i, Tuple) for i in grid):
+                elif isinstance(head, tuple) and all(
+                    isinstance(i, tuple) for i in grid
+                ):
                     self.npanels = len(grid)
                     self.shape = _find_max_tuple(grid)
 
@@ -184,30 +215,28 @@ class MultiPanel(object):
             else:
                 # Make a panel at each cell of the grid defined by shape
                 try:
-                    self.shape = shape
-                    self.npanels = int(np.prod(shape))
+                    nrows, ncols = shape
+                    grid = list(product(range(nrows), range(ncols)))
 
-                except ValueError:
+                except (TypeError, ValueError):
                     raise TypeError(
                         "Sorry, ``shape`` is not a valid input. "
                         "Refer to the documentation for supported input types."
                     )
 
-                grid = list()
-                for row in range(self.shape[0]):
-                    for col in range(self.shape[1]):
-                        grid.append((row, col))
+                self.shape = shape
+                self.npanels = nrows * ncols
 
             self._locations = grid
 
             # Get labels based on provided vector or revert to default
             if isinstance(labels, bool):
-                self._labels = _get_letters(case=kwargs.pop("label_case", "uppercase"))[
-                    : self.npanels
-                ]
+                self._labels = _default_labels(
+                    kwargs.pop("label_case", "uppercase"), self.npanels
+                )
                 draw_labels = labels
 
-            elif isinstance(labels, Iterable):
+            elif hasattr(labels, "__iter__"):
                 assert (
                     len(labels) == self.npanels
                 ), "Length of label vector does not match number of panels."
@@ -247,12 +276,10 @@ class MultiPanel(object):
             height_ratios=kwargs.pop("height_ratios", None),
         )
 
-        Panels = namedtuple("Panels", [i for i in self._labels])
-        self.panels = Panels(
-            *[
-                self.fig.add_subplot(_get_grid_location(loc, self.gridspec))
-                for loc in self._locations
-            ]
+        # The SubplotSpec of each panel is computed only once and kept
+        self._specs = [self.gridspec[_get_slices(loc)] for loc in self._locations]
+        self.panels = _Panels(
+            [self.fig.add_subplot(spec) for spec in self._specs], self._labels
         )
 
         # If labels should be drawn, draw them now.
@@ -269,26 +296,33 @@ class MultiPanel(object):
         size,
         weight,
     ) -> None:
+        """
+        Draws the figure labels onto the panels.
 
-        for ix in range(self.npanels):
-
-            # make separate axis for label
-            loc = self._locations[ix]
-            axis_loc = (int(np.min(loc[0])), int(np.min(loc[1])))
-            ax = self.fig.add_subplot(
-                _get_grid_location(axis_loc, self.gridspec), label=self._labels[ix]
-            )
-            ax.axis("off")
+        Args:
+            label_location (Tuple): Location of the labels relative to a single grid cell
+                at the top left of each panel.
+            size (int): Font size of the labels.
+            weight (str): Font weight of the labels.
+        """
 
-            ax.text(
-                label_location[0],
-                label_location[1],
-                self._labels[ix],
-                transform=ax.transAxes,
+        # Labels are drawn onto the panels themselves, so no additional axes have to
+        # be created to host them, and constrained layout makes room for them.
+        # They usually lie outside of the axes and must therefore not be clipped.
+        # The location is scaled by the number of cells a panel spans, so that it is
+        # relative to its top left cell and labels line up across panels.
+        for panel, spec, label in zip(self.panels, self._specs, self._labels):
+            nrows, ncols = len(spec.rowspan), len(spec.colspan)
+            panel.text(
+                label_location[0] / ncols,
+                1 - (1 - label_location[1]) / nrows,
+                label,
+                transform=panel.transAxes,
                 size=size,
                 weight=weight,
                 usetex=False,
                 family="sans-serif",
+                clip_on=False,
             )
 
     def save(self,
@@ -324,23 +358,70 @@ class MultiPanel(object):
         plt.close(self.fig)
 
 
+class _Panels(tuple):
+
+    """
+    Tuple of panel axes that can also be accessed by their label,
+    either as attribute (``panels.A``) or as key (``panels['A']``).
+    """
+
+    def __new__(cls, axes, labels):
+        panels = super().__new__(cls, axes)
+        panels._fields = tuple(labels)
+        panels._map = dict(zip(labels, axes))
+        return panels
+
+    def __getnewargs__(self):
+        # required by copy and pickle, as __new__ also takes the labels
+        return tuple(self), self._fields
+
+    def _asdict(self) -> dict:
+        """
+        Returns a new dictionary mapping labels to panels, like ``namedtuple._asdict``.
+        """
+        return dict(self._map)
+
+    def __getattr__(self, label):
+        try:
+            return self._map[label]
+        except KeyError:
+            raise AttributeError(label) from None
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._map[key]
+        return super().__getitem__(key)
+
+
+@lru_cache(maxsize=2)
 def _get_letters(case: Optional[str] = "uppercase") -> str:
     """
 
-    :param case: 'lowercase' or 'uppercase'. Defaults to 'lowercase'.
+    :param case: 'lowercase' or 'uppercase'. Defaults to 'uppercase'.
     :return: string of ordered alphabet
     """
-    if case == "lowercase":
-        return string.ascii_lowercase
-    else:
-        return string.ascii_uppercase
+    return _LETTERS.get(case, _LETTERS["uppercase"])
+
+
+@lru_cache(maxsize=64)
+def _default_labels(case: str, npanels: int) -> str:
+    """
+    Helper function returning the default labels of a figure, i.e. the first ``npanels`` letters
+    of the alphabet. Cached, because figures are often created repeatedly with the same layout.
+
+    :param case: 'lowercase' or 'uppercase'
+    :param npanels: number of panels
+    :return: string of labels
+    """
+    return _get_letters(case)[:npanels]
 
 
 def _is_iter_of_iters(labels) -> bool:
     """
     Helper function to check for iterable of iterables
     """
-    return isinstance(labels, Iterable) and all(isinstance(_, Iterable) for _ in labels)
+    # duck-typed, as isinstance checks against the Iterable ABC are comparatively slow
+    return hasattr(labels, "__iter__") and all(hasattr(_, "__iter__") for _ in labels)
 
 
 def _decode_label_array(labels: Iterable[Iterable]) -> dict:
@@ -370,34 +451,33 @@ def _decode_label_array(labels: Iterable[Iterable]) -> dict:
             "each sub-iterable is the same length"
         )
 
-    # collect grid positions for each label
-    label_pos = defaultdict(list)
+    # track the bounding box [min row, max row, min col, max col] and cell count of each label
+    # in a single pass, in order of first appearance in the grid
+    stats = {}
     for i, row in enumerate(label_grid):
         for j, label in enumerate(row):
-            label_pos[label].append((i, j))
+            s = stats.get(label)
+            if s is None:
+                stats[label] = [i, i, j, j, 1]
+            else:
+                s[0] = min(s[0], i)
+                s[1] = max(s[1], i)
+                s[2] = min(s[2], j)
+                s[3] = max(s[3], j)
+                s[4] += 1
 
-    # ensure labels spanning grid points are linear contiguous
     label_dict = {}
-    for label, positions in label_pos.items():
-
-        rows = list(set([_[0] for _ in positions]))
-        cols = list(set([_[1] for _ in positions]))
-
-        row_range = range(min(rows), max(rows) + 1)
-        col_range = range(min(cols), max(cols) + 1)
+    for label, (r0, r1, c0, c1, count) in stats.items():
 
-        # check that the label grid positions form a box
-        expected_coords = list(product(rows, cols))
-        if set(positions) != set(expected_coords):
+        # a label forms a box iff it fills every cell of its bounding box
+        if count != (r1 - r0 + 1) * (c1 - c0 + 1):
             raise TypeError(
                 "Sorry, label grid spec contains invalid layout; "
                 "all identical label positions must be adjacent"
             )
 
-        if len(rows) == 1:
-            row_range = rows[0]
-        if len(cols) == 1:
-            col_range = cols[0]
+        row_range = r0 if r0 == r1 else range(r0, r1 + 1)
+        col_range = c0 if c0 == c1 else range(c0, c1 + 1)
 
         label_dict[label] = (row_range, col_range)
 
@@ -417,20 +497,31 @@ def _get_grid_location(
     :param gridspec: matplotlib GridSpec object
     :return: matplotlib SubplotSpec object
     """
-    rows, cols = location
+    return gridspec[_get_slices(location)]
 
-    # if both are integers
-    if isinstance(rows, int) and isinstance(cols, int):
-        return gridspec[rows, cols]
 
-    elif isinstance(rows, Iterable) and isinstance(cols, int):
-        return gridspec[rows[0] : rows[-1] + 1, cols]
+def _get_slices(location: Tuple) -> Tuple[slice, slice]:
+    """
+    Normalizes a location tuple to a pair of slices that can be used to index a GridSpec.
 
-    elif isinstance(rows, int) and isinstance(cols, Iterable):
-        return gridspec[rows, cols[0] : cols[-1] + 1]
+    :param location: Tuple of locations, see ``_get_grid_location``
+    :return: Tuple of row and column slices
+    """
+    rows, cols = location
 
-    elif isinstance(rows, Iterable) and isinstance(cols, Iterable):
-        return gridspec[rows[0] : rows[-1] + 1, cols[0] : cols[-1] + 1]
+    # integers index a single cell, anything else spans from its first to its last element.
+    # A stop of 0 means the last cell was reached by a negative index, so it becomes None.
+    if isinstance(rows, int):
+        rows = slice(rows, rows + 1 or None)
+    else:
+        rows = slice(rows[0], rows[-1] + 1 or None)
+
+    if isinstance(cols, int):
+        cols = slice(cols, cols + 1 or None)
+    else:
+        cols = slice(cols[0], cols[-1] + 1 or None)
+
+    return rows, cols
 
 
 def _get_subplot_raster(
@@ -453,19 +544,19 @@ def _get_subplot_raster(
     # calculate shape based on length of grid and least common multiple of grid
     shape = (len(grid), _lcm_of_array(grid))
 
-    for row in range(len(grid)):
+    for row, ncols in enumerate(grid):
 
-        # Size of each plot in this row
-        size = shape[1] / grid[row]
+        # Size of each plot in this row. The lcm is divisible by every row,
+        # so integer arithmetic is exact.
+        size = shape[1] // ncols
 
         # Make tuples of locations of each plot
-        for panel in range(grid[row]):
-            if size == 1:
-                locations.append((row, panel))
-            else:
-                locations.append(
-                    (row, range(int(panel * size), int(panel * size + size)))
-                )
+        if size == 1:
+            locations.extend((row, col) for col in range(ncols))
+        else:
+            locations.extend(
+                (row, range(col, col + size)) for col in range(0, shape[1], size)
+            )
 
     return shape, locations, npanels
 
@@ -477,10 +568,12 @@ def _lcm_of_array(a: Iterable[int]) -> int:
     :return: integer
     """
 
-    lcm = a[0]
-    for i in range(1, len(a)):
-        lcm = lcm * a[i] // math.gcd(lcm, a[i])
-    return lcm
+    a = [int(i) for i in a]
+
+    # math.lcm is only available from Python 3.9 onwards
+    if hasattr(math, "lcm"):
+        return math.lcm(*a)
+    return reduce(lambda x, y: x * y // math.gcd(x, y), a, 1)
 
 
 def _find_max_tuple(
@@ -491,13 +584,30 @@ def _find_max_tuple(
     :param x: List of Tuples
     :return: Tuple of maximum values of first and second dimension that occur in x
     """
-    max1 = np.max([np.max(i[0]) for i in x])
-    max2 = np.max([np.max(i[1]) for i in x])
+    max1 = max2 = -1
+    for rows, cols in x:
+        max1 = max(max1, _max_index(rows))
+        max2 = max(max2, _max_index(cols))
 
     # Add plus one to output to transform to dimensionality (i.e. a max value of 0 indicates 1 dimension)
     return max1 + 1, max2 + 1
 
 
+def _max_index(x: Union[Iterable, int]) -> int:
+    """
+    Helper function returning the largest grid index of a single location coordinate.
+    Ranges are resolved in constant time from their bounds.
+
+    :param x: int, range or Iterable of ints
+    :return: integer
+    """
+    if isinstance(x, range):
+        return x[-1]
+    if hasattr(x, "__iter__"):
+        return max(x)
+    return x
+
+
 def _panel_overlap(locations, shape=None):
     """
     Check a list of (x,y) location coordinates, which may be ranges, to ensure
@@ -507,18 +617,14 @@ def _panel_overlap(locations, shape=None):
     :param shape: the shape the locations should fit into (deprecated)
     """
 
-    # expand all coordinates for each location
-    coords = []
+    # mark the cells of each location as occupied, stopping at the first collision
+    occupied = set()
     for loc in locations:
         xlocs = loc[0] if isinstance(loc[0], range) else [loc[0]]
         ylocs = loc[1] if isinstance(loc[1], range) else [loc[1]]
-        coords.append(list(product(xlocs, ylocs)))
-
-    # examine all pairs of locations to make sure nothing overlaps
-    overlap = False
-    for loc1, loc2 in combinations(coords, 2):
-        overlap = set(loc1).intersection(loc2)
-        if overlap:
-            break
+        for cell in product(xlocs, ylocs):
+            if cell in occupied:
+                return {cell}
+            occupied.add(cell)
 
-    return overlap
+    return set()
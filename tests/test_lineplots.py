@@ -0,0 +1,41 @@
+"""Tests for `spiffyplots.lineplots` module."""
+
+# Use the non-interactive backend before anything imports pyplot
+import matplotlib
+
+matplotlib.use("Agg", force=True)
+
+import unittest
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from spiffyplots.lineplots import multiline
+
+
+class Test_multiline(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up an empty axis to draw on
+        """
+        self.fig, self.axis = plt.subplots()
+
+    def tearDown(self):
+        plt.close(self.fig)
+
+    def test_equal_length(self):
+        x = np.tile(np.arange(10), (3, 1))
+        y = np.random.randn(3, 10)
+        lc = multiline(x, y, c=[0, 1, 2], axis=self.axis)
+
+        segments = lc.get_segments()
+        self.assertEqual(len(segments), 3)
+        np.testing.assert_array_equal(segments[1], np.column_stack([x[1], y[1]]))
+        self.assertIn(lc, self.axis.collections)
+
+    def test_ragged(self):
+        x = [np.arange(10), np.arange(5)]
+        y = [np.random.randn(10), np.random.randn(5)]
+        lc = multiline(x, y, c=[0, 1], axis=self.axis)
+
+        self.assertEqual([s.shape for s in lc.get_segments()], [(10, 2), (5, 2)])
@@ -1,25 +1,56 @@
 """Tests for `spiffyplots.multipanel` module."""
 
+# Use the non-interactive backend before anything imports pyplot,
+# so that no GUI canvases are created for the test figures
+import matplotlib
+
+matplotlib.use("Agg", force=True)
+
+import copy
 from itertools import product
 
 import unittest
 import pytest
 import spiffyplots.multipanel as mp
 
-import matplotlib
+import matplotlib.pyplot as plt
 import numpy as np
 
 
 class TestMutiPanel(unittest.TestCase):
     """Tests for `spiffyplots` package."""
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Set up test fixtures for spiffyplots.multipanel
+        Set up test fixtures for spiffyplots.multipanel.
+        Each distinct configuration is constructed once and shared between tests.
         """
+        cls.fig_default = mp.MultiPanel()
+        cls.fig_grid_intlist = mp.MultiPanel(grid=(3, 4, 4, 1))
+        cls.fig_grid_intlist2 = mp.MultiPanel(grid=(2, 1))
+        cls.grid_tuples = [(0, 0), (0, 1), (range(1, 3), 0), (range(1, 3), 1)]
+        cls.fig_grid_tuples = mp.MultiPanel(grid=cls.grid_tuples)
+        cls.labels_dict = {
+            "A1": (0, 0),
+            "A2": (0, 1),
+            "B": (range(1, 3), 0),
+            "C": (range(1, 3), 1),
+        }
+        cls.fig_labels_dict = mp.MultiPanel(labels=cls.labels_dict)
+        cls.labels_list = ["A1", "A2", "B1", "B2"]
+        cls.fig_labels_list = mp.MultiPanel(labels=cls.labels_list)
+        cls.fixture_fignums = set(plt.get_fignums())
 
     def tearDown(self):
-        """Tear down test fixtures, if any."""
+        """Close the figures created by a test, keeping the shared fixtures."""
+        for num in set(plt.get_fignums()) - self.fixture_fignums:
+            plt.close(num)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Close all figures at once."""
+        plt.close("all")
 
     def test_init_001_default(self):
         """
@@ -28,12 +59,17 @@ class TestMutiPanel(unittest.TestCase):
         001 - Default initialization with no parameters
         (Should create a 2x2 grid with 4 equal panels)
         """
-        fig = mp.MultiPanel()
+        fig = self.fig_default
 
         # assert 4 panels
         self.assertEqual(fig.panels.__len__(), 4)
         self.assertEqual(fig._labels, "ABCD")
         self.assertEqual(fig.shape, (2, 2))
+        self.assertEqual(fig._locations, [(0, 0), (0, 1), (1, 0), (1, 1)])
+        self.assertEqual(
+            fig._prop_colors,
+            matplotlib.rcParams["axes.prop_cycle"].by_key()["color"],
+        )
 
     def test_init_002_grid_intlist(self):
         """
@@ -42,21 +78,34 @@ class TestMutiPanel(unittest.TestCase):
         002 - Initialization based on ``grid`` being a list of integers that define the number of panels in each row.
         """
 
-        grid = (3, 4, 4, 1)  # 12 panels
-        fig = mp.MultiPanel(grid=grid)
+        fig = self.fig_grid_intlist  # grid = (3, 4, 4, 1), 12 panels
 
         self.assertEqual(fig.panels.__len__(), 12)
         self.assertEqual(fig._labels, "ABCDEFGHIJKL")
         self.assertEqual(fig.shape, (4, 12))
 
-        grid2 = (2, 1)  # 3 panels with location tuple test
-        fig2 = mp.MultiPanel(grid=grid2)
+        fig2 = self.fig_grid_intlist2  # grid = (2, 1), 3 panels
 
         self.assertEqual(fig2.panels.__len__(), 3)
         self.assertEqual(fig2._labels, "ABC")
         self.assertEqual(fig2.shape, (2, 2))
         self.assertEqual(fig2._locations, [(0, 0), (0, 1), (1, range(0, 2))])
 
+        # drawing labels does not add any axes
+        fig3 = mp.MultiPanel(grid=(2, 1), labels=True)
+        self.assertEqual(len(fig3.fig.axes), 3)
+        self.assertEqual([p.texts[0].get_text() for p in fig3.panels], ["A", "B", "C"])
+        self.assertFalse(fig3.panels[0].texts[0].get_clip_on())
+
+        # labels of one-cell and spanning panels in the same column line up
+        fig4 = mp.MultiPanel(grid=(2, 1), labels=True, wspace=0, hspace=0)
+        to_figure = fig4.fig.transFigure.inverted()
+        x_label = [
+            to_figure.transform(p.transAxes.transform(p.texts[0].get_position()))[0]
+            for p in fig4.panels
+        ]
+        self.assertAlmostEqual(x_label[0], x_label[2])
+
     def test_init_003_grid_tuples(self):
         """
         Test initialization of MultiPanel object.
@@ -64,13 +113,37 @@ class TestMutiPanel(unittest.TestCase):
         003 - Initialization based on ``grid`` being a list of location tuples.
         """
 
-        grid = [(0, 0), (0, 1), (range(1, 3), 0), (range(1, 3), 1)]
-        fig = mp.MultiPanel(grid=grid)
+        grid = self.grid_tuples
+        fig = self.fig_grid_tuples
 
         self.assertEqual(fig.panels.__len__(), 4)
         self.assertEqual(fig._labels, "ABCD")
         self.assertEqual(fig.shape, (3, 2))
         self.assertEqual(fig._locations, grid)
+        self.assertEqual(fig._specs, [p.get_subplotspec() for p in fig.panels])
+
+        # negative coordinates count from the end of the grid
+        fig = mp.MultiPanel(grid=[(0, range(0, 2)), (1, 0), (1, -1)])
+        self.assertEqual(fig.panels[2].get_subplotspec(), fig.gridspec[1, -1])
+
+        # grid can be passed as a generator
+        fig = mp.MultiPanel(grid=((0, col) for col in range(3)))
+        self.assertEqual(fig.shape, (1, 3))
+        self.assertEqual(fig._locations, [(0, 0), (0, 1), (0, 2)])
+
+        # panels follow the order of the grid, even if it fills the grid cell by cell
+        grid = [(1, 1), (0, 0), (1, 0), (0, 1)]
+        fig = mp.MultiPanel(grid=grid)
+
+        for panel, spec, loc in zip(fig.panels, fig._specs, grid):
+            self.assertEqual(panel.get_subplotspec(), fig.gridspec[loc])
+            self.assertEqual(spec, fig.gridspec[loc])
+        self.assertEqual(fig.fig.axes, list(fig.panels))
+
+        # negative coordinates do not merge panels that fill the grid
+        fig = mp.MultiPanel(grid=[(0, 0), (0, 1), (1, 0), (0, -1)])
+        self.assertEqual(len(set(fig.panels)), 4)
+        self.assertEqual(fig.fig.axes, list(fig.panels))
 
     def test_init_004_labels_dict(self):
         """
@@ -80,14 +153,8 @@ class TestMutiPanel(unittest.TestCase):
         mapping panel labels to locations.
         """
 
-        labels = {
-            "A1": (0, 0),
-            "A2": (0, 1),
-            "B": (range(1, 3), 0),
-            "C": (range(1, 3), 1),
-        }
-
-        fig = mp.MultiPanel(labels=labels)
+        labels = self.labels_dict
+        fig = self.fig_labels_dict
 
         self.assertEqual(fig.panels.__len__(), 4)
         self.assertEqual(fig._labels, list(labels.keys()))
@@ -101,11 +168,35 @@ class TestMutiPanel(unittest.TestCase):
         005 - Initialization based on ``labels`` being a list of custom labels.
         """
 
-        labels = ["A1", "A2", "B1", "B2"]
-        fig = mp.MultiPanel(labels=labels)
+        labels = self.labels_list
+        fig = self.fig_labels_list
         self.assertEqual(fig.panels.__len__(), 4)
         self.assertEqual(fig._labels, labels)
 
+    def test_panels_access(self):
+        """
+        Test access to panels by index, attribute and label.
+        """
+
+        fig = mp.MultiPanel(labels=["A", "B", "1", "panel d"])
+
+        self.assertIs(fig.panels.A, fig.panels[0])
+        self.assertIs(fig.panels["B"], fig.panels[1])
+        self.assertIs(fig.panels["1"], fig.panels[2])
+        self.assertIs(fig.panels["panel d"], fig.panels[-1])
+        self.assertEqual(len(fig.panels[1:]), 3)
+        self.assertRaises(AttributeError, getattr, fig.panels, "E")
+
+        # namedtuple API of the former implementation
+        self.assertEqual(fig.panels._fields, ("A", "B", "1", "panel d"))
+        self.assertEqual(list(fig.panels._asdict().values()), list(fig.panels))
+
+        # copies keep both the panels and their labels
+        for copied in (copy.copy(fig.panels), copy.deepcopy(fig.panels)):
+            self.assertEqual(len(copied), 4)
+            self.assertEqual(copied._fields, fig.panels._fields)
+            self.assertIs(copied["panel d"], copied[-1])
+
     def test_init_006_labels_array(self):
         """
         Test initialization of MultiPanel object.
@@ -153,53 +244,83 @@ class TestMutiPanel(unittest.TestCase):
 
         self.assertEqual(fig._labels, "abcd")
 
+        # explicit margins switch off constrained layout, which is used by default
+        self.assertFalse(fig.fig.get_constrained_layout())
+        self.assertTrue(self.fig_default.fig.get_constrained_layout())
+        self.assertFalse(
+            mp.MultiPanel(constrained_layout=False).fig.get_constrained_layout()
+        )
+
     def test_errors_invalid_inputs(self):
         """
         Test TypeErrors if invalid inputs are given
         """
-        self.assertRaises(TypeError, mp.MultiPanel, grid=[1, 2, "string"])
-
-        self.assertRaises(TypeError, mp.MultiPanel, shape=(1, (2, 4)))
-
-        self.assertRaises(TypeError, mp.MultiPanel, labels=123)
+        cases = [
+            (dict(grid=[1, 2, "string"]), TypeError),
+            (dict(grid=[(0, 0), 1]), TypeError),
+            (dict(grid=[(0, 0), [0, 1]]), TypeError),
+            (dict(grid=[2, (0, 1)]), TypeError),
+            (dict(grid=[]), TypeError),
+            (dict(shape=(1, (2, 4))), TypeError),
+            (dict(shape=(1, 2, 3)), TypeError),
+            (dict(labels=123), TypeError),
+            # Too few labels for the number of panels
+            (dict(grid=(1, 3), labels=["ABC"]), AssertionError),
+        ]
 
-        # Too few labels for the number of panels
-        self.assertRaises(AssertionError, mp.MultiPanel, grid=(1, 3), labels=["ABC"])
+        for kwargs, exception in cases:
+            with self.subTest(kwargs=kwargs), self.assertRaises(exception):
+                mp.MultiPanel(**kwargs)
 
     def test_warnings(self):
         """
         Test Warnings if some conditions are met
         """
 
-        # If parameters given are ignored
-        self.assertWarns(
-            Warning, mp.MultiPanel, labels={"A1": (0, 0), "A2": (0, 1)}, shape=(3, 2)
-        )
+        cases = [
+            # If parameters given are ignored
+            dict(labels={"A1": (0, 0), "A2": (0, 1)}, shape=(3, 2)),
+            # If panels overlap
+            dict(labels={"A1": (0, 0), "A2": (0, range(2))}),
+        ]
 
-        # If panels overlap
-        self.assertWarns(
-            Warning, mp.MultiPanel, labels={"A1": (0, 0), "A2": (0, range(2))}
-        )
+        for kwargs in cases:
+            with self.subTest(kwargs=kwargs), self.assertWarns(Warning):
+                mp.MultiPanel(**kwargs)
 
 
 class Test_get_letters(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Generate the alphabets once for all tests
+        """
+        cls.lower = mp._get_letters(case="lowercase")
+        cls.upper = mp._get_letters(case="uppercase")
+        cls.default = mp._get_letters()
+
     def test_lowercase(self):
         """Test _get_letters."""
-        out = mp._get_letters(case="lowercase")
-        self.assertEqual(out[2], "c")
-        self.assertEqual(out[-1], "z")
+        self.assertEqual(self.lower[2], "c")
+        self.assertEqual(self.lower[-1], "z")
 
     def test_uppercase(self):
         """Test _get_letters."""
-        out = mp._get_letters(case="uppercase")
-        self.assertEqual(out[2], "C")
-        self.assertEqual(out[-1], "Z")
+        self.assertEqual(self.upper[2], "C")
+        self.assertEqual(self.upper[-1], "Z")
 
     def test_default(self):
         """Test _get_letters."""
-        out = mp._get_letters()
-        self.assertEqual(out[2], "C")
-        self.assertEqual(out[-1], "Z")
+        self.assertEqual(self.default[2], "C")
+        self.assertEqual(self.default[-1], "Z")
+
+
+class Test_default_labels(unittest.TestCase):
+    def test_default(self):
+        """Test _default_labels."""
+        self.assertEqual(mp._default_labels("uppercase", 3), "ABC")
+        self.assertEqual(mp._default_labels("lowercase", 5), "abcde")
+        self.assertEqual(mp._default_labels("unknown", 2), "AB")
 
 
 class Test_is_iter_of_iters(unittest.TestCase):
@@ -247,43 +368,51 @@ class Test_decode_label_array(unittest.TestCase):
     def test_complex_array(self):
         NotImplemented
 
-
-class Test_get_grid_location(unittest.TestCase):
-    def setUp(self):
-        """
-        Setup example gridspec object
-        """
-        self.grid = matplotlib.gridspec.GridSpec(3, 3)
-
-    def test_ints(self):
-        tuple = (0, 1)
-        out = mp._get_grid_location(tuple, self.grid)
-
-        self.assertEqual(out, self.grid[0, 1])
-
-    def test_int_rowrange(self):
-        tuple = (range(0, 2), 1)
-        out = mp._get_grid_location(tuple, self.grid)
-
-        self.assertEqual(out, self.grid[0:2, 1])
-
-    def test_int_colrange(self):
-        tuple = (1, range(0, 3))
-        out = mp._get_grid_location(tuple, self.grid)
-
-        self.assertEqual(out, self.grid[1, 0:3])
-
-    def test_ranges(self):
-        tuple = (range(0, 2), range(0, 3))
-        out = mp._get_grid_location(tuple, self.grid)
-
-        self.assertEqual(out, self.grid[0:2, 0:3])
-
-    def test_lists(self):
-        tuple = ([0, 1, 2], [0, 1])
-        out = mp._get_grid_location(tuple, self.grid)
-
-        self.assertEqual(out, self.grid[0:3, 0:2])
+    def test_label_order(self):
+        # labels are returned in order of first appearance, not sorted
+        grid_dict = mp._decode_label_array([["Z", "A", "A"], ["B", "B", "C"]])
+        self.assertEqual(list(grid_dict.keys()), ["Z", "A", "B", "C"])
+        self.assertTrue(grid_dict["B"] == (1, range(0, 2)))
+
+        # a label interrupted by another one does not form a box
+        self.assertRaises(TypeError, mp._decode_label_array, ["A", "B", "A"])
+
+        # any hashable object can serve as a label
+        grid_dict = mp._decode_label_array([[1, 1], [None, 2]])
+        self.assertEqual(grid_dict, {1: (0, range(0, 2)), None: (1, 0), 2: (1, 1)})
+
+
+@pytest.fixture(scope="module")
+def gridspec():
+    """
+    Example gridspec object, shared by all tests in this module
+    """
+    return matplotlib.gridspec.GridSpec(3, 3)
+
+
+@pytest.mark.parametrize(
+    "location, expected",
+    [
+        ((0, 1), (0, 1)),
+        ((range(0, 2), 1), (slice(0, 2), 1)),
+        ((1, range(0, 3)), (1, slice(0, 3))),
+        ((range(0, 2), range(0, 3)), (slice(0, 2), slice(0, 3))),
+        (([0, 1, 2], [0, 1]), (slice(0, 3), slice(0, 2))),
+        ((0, -1), (0, -1)),
+        ((range(-2, 0), -1), (slice(-2, None), -1)),
+    ],
+)
+def test_get_grid_location(gridspec, location, expected):
+    assert mp._get_grid_location(location, gridspec) == gridspec[expected]
+
+
+class Test_get_slices(unittest.TestCase):
+    def test_default(self):
+        self.assertEqual(mp._get_slices((0, 1)), (slice(0, 1), slice(1, 2)))
+        self.assertEqual(
+            mp._get_slices((range(1, 3), [0, 1, 2])), (slice(1, 3), slice(0, 3))
+        )
+        self.assertEqual(mp._get_slices((-1, 0)), (slice(-1, None), slice(0, 1)))
 
 
 class Test_get_subplot_raster(unittest.TestCase):
@@ -309,51 +438,41 @@ class Test_get_subplot_raster(unittest.TestCase):
         self.assertEqual(out_panels, 6)
 
 
-class Test_lcm_of_array(unittest.TestCase):
-    def setUp(self):
-        """
-        Setup example arrays
-        """
-        self.numpy = np.array([1, 2, 3, 4, 5])
-        self.list = [2, 3, 1]
-
-    def test_numpy(self):
-        out = mp._lcm_of_array(self.numpy)
-        self.assertEqual(out, 60)
-
-    def test_list(self):
-        out = mp._lcm_of_array(self.list)
-        self.assertEqual(out, 6)
-
-
-class Test_find_max_tuple(unittest.TestCase):
-    def setUp(self):
-        self.int_tuples = [(4, 6), (7, 3)]
-        self.range_tuples = [(range(3), range(5)), (range(3, 7), range(2, 5))]
-        self.long_mixed = [
-            (range(3), range(5)),
-            (10, 1),
-            (range(3, 7), range(2, 5)),
-            (range(4), 3),
-        ]
-
-    def test_int_tuples(self):
-        out = mp._find_max_tuple(self.int_tuples)
-        self.assertEqual(out, (8, 7))
-
-    def test_range_tuples(self):
-        out = mp._find_max_tuple(self.range_tuples)
-        self.assertEqual(out, (7, 5))
-
-    def test_long_mixed(self):
-        out = mp._find_max_tuple(self.long_mixed)
-        self.assertEqual(out, (11, 5))
-
-    def test_large_subplots(self):
-        grid_dict = mp._decode_label_array(
-            [["A", "B", "B"], ["C", "C", "C"], ["C", "C", "C"]]
-        )
-        self.assertEqual(mp._find_max_tuple(grid_dict.values()), (3, 3))
+@pytest.mark.parametrize(
+    "array, expected",
+    [
+        (np.array([1, 2, 3, 4, 5]), 60),
+        ([2, 3, 1], 6),
+        ([], 1),
+    ],
+)
+def test_lcm_of_array(array, expected):
+    out = mp._lcm_of_array(array)
+    assert out == expected
+    assert type(out) is int
+
+
+@pytest.mark.parametrize(
+    "locations, expected",
+    [
+        ([(4, 6), (7, 3)], (8, 7)),
+        ([(range(3), range(5)), (range(3, 7), range(2, 5))], (7, 5)),
+        (
+            [(range(3), range(5)), (10, 1), (range(3, 7), range(2, 5)), (range(4), 3)],
+            (11, 5),
+        ),
+        ([([0, 1, 2], 0), (1, [3, 1])], (3, 4)),
+    ],
+)
+def test_find_max_tuple(locations, expected):
+    assert mp._find_max_tuple(locations) == expected
+
+
+def test_find_max_tuple_large_subplots():
+    grid_dict = mp._decode_label_array(
+        [["A", "B", "B"], ["C", "C", "C"], ["C", "C", "C"]]
+    )
+    assert mp._find_max_tuple(grid_dict.values()) == (3, 3)
 
 
 class Test_panel_overlap(unittest.TestCase):
@@ -377,3 +496,13 @@ class Test_panel_overlap(unittest.TestCase):
             [["A", "B", "B"], ["C", "C", "C"], ["C", "C", "C"]]
         )
         self.assertFalse(mp._panel_overlap(grid_dict.values(), (3, 3)))
+
+    def test_return_value(self):
+        # always returns a set, also for a single panel
+        self.assertEqual(mp._panel_overlap([(0, 0)]), set())
+        self.assertEqual(
+            mp._panel_overlap([(0, range(0, 2)), (range(0, 2), 1)]), {(0, 1)}
+        )
+        fig = mp.MultiPanel(shape=(1, 1))
+        self.addCleanup(fig.close)
+        self.assertEqual(fig.npanels, 1)
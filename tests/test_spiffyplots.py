@@ -0,0 +1,22 @@
+"""Tests for the top-level `spiffyplots` package."""
+
+import os
+import subprocess
+import sys
+import unittest
+
+
+class Test_lazy_import(unittest.TestCase):
+    def test_import(self):
+        """
+        Importing the package does not import pyplot, but still resolves submodules.
+        Runs in a fresh interpreter, as the test session has already imported pyplot.
+        """
+        code = (
+            "import sys, spiffyplots\n"
+            "assert 'matplotlib.pyplot' not in sys.modules\n"
+            "assert spiffyplots.multipanel.MultiPanel is spiffyplots.MultiPanel\n"
+            "assert spiffyplots.lineplots.multiline is spiffyplots.multiline\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, "-c", code], cwd=root, check=True)